@@ -0,0 +1,531 @@
+#!/usr/bin/env python
+
+"""
+Benchmark and load test for server.py
+
+Builds the project schema in a local database, seeds it at a chosen scale
+and drives every route of the web app, reporting p50/p95/p99 latency,
+throughput and SQL statements per request for each one.
+
+By default the database is a fresh SQLite file and the routes are driven
+in-process through Flask's test client:
+
+    python bench.py --applications 10000
+
+A local Postgres works the same way (the database must exist and will be
+wiped):
+
+    python bench.py --database postgresql://localhost/bench --applications 1000000
+
+To load test a running server over HTTP instead, seed its database first and
+point the benchmark at it (statements per request are only known in-process):
+
+    python bench.py --database postgresql://localhost/bench --seed-only
+    DATABASEURI=postgresql://localhost/bench python server.py &
+    python bench.py --database postgresql://localhost/bench --no-seed --url http://localhost:8111 --concurrency 16
+
+--dashboards compares the biggest host, recruiter, company and application
+pages rendered whole and streamed (?stream=1): time to first byte, total
+time and peak memory.
+
+The migrations in migrations/ are applied after seeding unless
+--skip-migrations is given.
+
+Results can be saved with --save and compared against an earlier run with
+--baseline; the run then fails if a route got slower (p95) or issues more
+statements per request than the baseline allows.
+"""
+
+import os
+import sys
+import json
+import math
+import random
+import resource
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from sqlalchemy import event, text
+
+
+#
+# Schema.  {serial} becomes the auto-incrementing primary key type of the
+# target database.
+#
+SCHEMA = [
+  "CREATE TABLE Candidates (id {serial}, first_name VARCHAR(50) NOT NULL, last_name VARCHAR(50) NOT NULL, phone VARCHAR(20), email VARCHAR(100) UNIQUE)",
+  "CREATE TABLE Hosts (id {serial}, first_name VARCHAR(50) NOT NULL, last_name VARCHAR(50) NOT NULL, organization VARCHAR(100))",
+  "CREATE TABLE Events (id {serial}, date DATE NOT NULL, time TIME, description VARCHAR(200), location VARCHAR(100), capacity INTEGER)",
+  "CREATE TABLE Organizes (budget NUMERIC(12, 2), event_id INTEGER NOT NULL REFERENCES Events(id) ON DELETE CASCADE, host_id INTEGER NOT NULL REFERENCES Hosts(id), PRIMARY KEY (event_id, host_id))",
+  "CREATE TABLE Companys (id {serial}, name VARCHAR(100) NOT NULL, description VARCHAR(200), location VARCHAR(100))",
+  "CREATE TABLE invites (event_id INTEGER NOT NULL REFERENCES Events(id) ON DELETE CASCADE, host_id INTEGER REFERENCES Hosts(id), company_id INTEGER NOT NULL REFERENCES Companys(id), PRIMARY KEY (event_id, company_id))",
+  "CREATE TABLE Recruiters (id {serial}, first_name VARCHAR(50) NOT NULL, last_name VARCHAR(50) NOT NULL, company_id INTEGER NOT NULL REFERENCES Companys(id), phone VARCHAR(20), email VARCHAR(100), title VARCHAR(100))",
+  "CREATE TABLE Positions (id {serial}, name VARCHAR(100), description VARCHAR(200), location VARCHAR(100), company_id INTEGER NOT NULL REFERENCES Companys(id))",
+  "CREATE TABLE Applications (id {serial}, candidate_id INTEGER NOT NULL REFERENCES Candidates(id), position_id INTEGER NOT NULL REFERENCES Positions(id), date DATE, time TIME, resume CHAR(1))",
+  "CREATE TABLE Approves (recruiter_id INTEGER NOT NULL REFERENCES Recruiters(id), application_id INTEGER NOT NULL REFERENCES Applications(id), PRIMARY KEY (recruiter_id, application_id))",
+  "CREATE TABLE interviews (id {serial}, application_id INTEGER NOT NULL REFERENCES Applications(id), recruiter_id INTEGER REFERENCES Recruiters(id), date DATE, time TIME)",
+  "CREATE TABLE Attends (candidate_id INTEGER NOT NULL REFERENCES Candidates(id), event_id INTEGER NOT NULL REFERENCES Events(id) ON DELETE CASCADE, PRIMARY KEY (candidate_id, event_id))",
+  "CREATE TABLE test (id {serial}, name TEXT)",
+]
+
+TABLES = ["position_stats", "company_stats", "recruiter_stats", "event_stats", "Attends", "interviews", "Approves", "Applications", "Positions", "Recruiters", "invites", "Companys", "Organizes", "Events", "Hosts", "Candidates", "test", "schema_migrations"]
+
+
+def create_schema(engine):
+  """
+  Drops the project tables if they exist and creates them again.
+  """
+  serial = "SERIAL PRIMARY KEY" if engine.dialect.name == "postgresql" else "INTEGER PRIMARY KEY"
+  with engine.begin() as conn:
+    for table in TABLES:
+      conn.execute("DROP TABLE IF EXISTS %s%s" % (table, " CASCADE" if engine.dialect.name == "postgresql" else ""))
+    for statement in SCHEMA:
+      conn.execute(statement.format(serial=serial))
+
+
+class Scale(object):
+  """
+  Row counts of every table, derived from the number of applications.
+  """
+
+  def __init__(self, applications):
+    self.applications = applications
+    self.candidates = max(20, applications // 5)
+    self.companys = max(10, applications // 200)
+    self.positions = self.companys * 5
+    self.recruiters = self.companys * 3
+    self.hosts = max(10, applications // 500)
+    self.events = self.hosts * 10
+    # Events only ever touched by the deleteEvent scenario.
+    self.disposable_events = 0
+    self.approves = applications * 3 // 10
+    self.interviews = applications // 10
+    self.attends = self.candidates * 2
+
+
+def skewed(rng, n):
+  """
+  A random id in 1..n where low ids are much more likely, so that a few
+  hosts, recruiters and candidates get large dashboards.
+  """
+  return int(n * rng.random() ** 3) + 1
+
+
+def random_date(rng):
+  return "%04d-%02d-%02d" % (rng.randint(2023, 2026), rng.randint(1, 12), rng.randint(1, 28))
+
+
+def random_time(rng):
+  return "%02d:%02d:00" % (rng.randint(8, 18), rng.choice((0, 15, 30, 45)))
+
+
+def insert_rows(conn, statement, rows, chunk=10000):
+  for start in range(0, len(rows), chunk):
+    conn.execute(text(statement), rows[start:start + chunk])
+
+
+def seed(engine, scale, rng, disposable_events):
+  """
+  Fills the schema with deterministic rows at the given scale.
+  """
+  scale.disposable_events = disposable_events
+  with engine.begin() as conn:
+    insert_rows(conn, "INSERT INTO test (name) VALUES (:name)", [{"name": n} for n in ("grace hopper", "alan turing", "ada lovelace")])
+    insert_rows(conn, "INSERT INTO Candidates (id, first_name, last_name, phone, email) VALUES (:id, :first_name, :last_name, :phone, :email)",
+                [{"id": i, "first_name": "Cand%d" % i, "last_name": "Idate%d" % i, "phone": "555%07d" % i, "email": "candidate%d@example.com" % i}
+                 for i in range(1, scale.candidates + 1)])
+    insert_rows(conn, "INSERT INTO Hosts (id, first_name, last_name, organization) VALUES (:id, :first_name, :last_name, :organization)",
+                [{"id": i, "first_name": "Host%d" % i, "last_name": "Ost%d" % i, "organization": "Org %d" % (i % 50)}
+                 for i in range(1, scale.hosts + 1)])
+    events = scale.events + disposable_events
+    insert_rows(conn, "INSERT INTO Events (id, date, time, description, location, capacity) VALUES (:id, :date, :time, :description, :location, :capacity)",
+                [{"id": i, "date": random_date(rng), "time": random_time(rng), "description": "Event %d" % i, "location": "Hall %d" % (i % 20), "capacity": rng.randint(10, 500)}
+                 for i in range(1, events + 1)])
+    insert_rows(conn, "INSERT INTO Organizes (budget, event_id, host_id) VALUES (:budget, :event_id, :host_id)",
+                [{"budget": rng.randint(100, 10000), "event_id": i, "host_id": skewed(rng, scale.hosts)} for i in range(1, events + 1)])
+    insert_rows(conn, "INSERT INTO Companys (id, name, description, location) VALUES (:id, :name, :description, :location)",
+                [{"id": i, "name": "Company %d" % i, "description": "Makes things %d" % i, "location": "City %d" % (i % 30)}
+                 for i in range(1, scale.companys + 1)])
+    invites = set()
+    for event_id in range(1, scale.events + 1):
+      for k in range(5):
+        invites.add((event_id, skewed(rng, scale.companys)))
+    insert_rows(conn, "INSERT INTO invites (event_id, host_id, company_id) VALUES (:event_id, NULL, :company_id)",
+                [{"event_id": e, "company_id": c} for e, c in sorted(invites)])
+    insert_rows(conn, "INSERT INTO Recruiters (id, first_name, last_name, company_id, phone, email, title) VALUES (:id, :first_name, :last_name, :company_id, :phone, :email, :title)",
+                [{"id": i, "first_name": "Rec%d" % i, "last_name": "Ruiter%d" % i, "company_id": (i - 1) % scale.companys + 1,
+                  "phone": "556%07d" % i, "email": "recruiter%d@example.com" % i, "title": "Recruiter"} for i in range(1, scale.recruiters + 1)])
+    insert_rows(conn, "INSERT INTO Positions (id, name, description, location, company_id) VALUES (:id, :name, :description, :location, :company_id)",
+                [{"id": i, "name": "Position %d" % i, "description": "Does work %d" % i, "location": "City %d" % (i % 30), "company_id": (i - 1) % scale.companys + 1}
+                 for i in range(1, scale.positions + 1)])
+    insert_rows(conn, "INSERT INTO Applications (id, candidate_id, position_id, date, time, resume) VALUES (:id, :candidate_id, :position_id, :date, :time, :resume)",
+                [{"id": i, "candidate_id": skewed(rng, scale.candidates), "position_id": rng.randint(1, scale.positions),
+                  "date": random_date(rng), "time": random_time(rng), "resume": rng.choice("YN")} for i in range(1, scale.applications + 1)])
+    approves = set()
+    while len(approves) < scale.approves:
+      approves.add((skewed(rng, scale.recruiters), rng.randint(1, scale.applications)))
+    insert_rows(conn, "INSERT INTO Approves (recruiter_id, application_id) VALUES (:recruiter_id, :application_id)",
+                [{"recruiter_id": r, "application_id": a} for r, a in sorted(approves)])
+    insert_rows(conn, "INSERT INTO interviews (id, application_id, recruiter_id, date, time) VALUES (:id, :application_id, :recruiter_id, :date, :time)",
+                [{"id": i, "application_id": rng.randint(1, scale.applications), "recruiter_id": skewed(rng, scale.recruiters),
+                  "date": random_date(rng), "time": random_time(rng)} for i in range(1, scale.interviews + 1)])
+    attends = set()
+    while len(attends) < scale.attends:
+      attends.add((skewed(rng, scale.candidates), rng.randint(1, scale.events)))
+    insert_rows(conn, "INSERT INTO Attends (candidate_id, event_id) VALUES (:candidate_id, :event_id)",
+                [{"candidate_id": c, "event_id": e} for c, e in sorted(attends)])
+    if engine.dialect.name == "postgresql":
+      for table in ("Candidates", "Hosts", "Events", "Companys", "Recruiters", "Positions", "Applications", "interviews"):
+        conn.execute("SELECT setval(pg_get_serial_sequence('%s', 'id'), (SELECT MAX(id) FROM %s))" % (table.lower(), table))
+
+
+#
+# Scenarios: one per route (or per interesting code path of a route).  Each
+# one is (name, method, function(rng, scale, n) returning (path, data)),
+# data being None, a dict of form fields or a (content type, body) pair.
+# n counts the requests already made for the scenario.  Scenarios for
+# routes added later go at the end, so that the requests of the earlier
+# ones stay the same for a given --seed.
+#
+def _host(rng, scale):
+  i = skewed(rng, scale.hosts)
+  return i, "first_name=Host%d&last_name=Ost%d" % (i, i)
+
+def _recruiter(rng, scale):
+  i = skewed(rng, scale.recruiters)
+  return "first_name=Rec%d&last_name=Ruiter%d" % (i, i)
+
+def _ids(rng, n, k):
+  return ",".join(str(rng.randint(1, n)) for i in range(k))
+
+def _bulk_applications(rng, scale, n):
+  rows = ["%d,%d,Y" % (rng.randint(1, scale.candidates), rng.randint(1, scale.positions)) for i in range(100)]
+  return "/bulk/applications", ("text/csv", "candidate_id,position_id,resume\n" + "\n".join(rows) + "\n")
+
+def _bulk_candidates(rng, scale, n):
+  nonce = rng.randint(0, 10 ** 9)
+  rows = ['{"first_name": "Bulk", "last_name": "Cand", "email": "bulk%d.%d.%d@example.com"}' % (n, nonce, i) for i in range(100)]
+  return "/bulk/candidates", ("application/x-ndjson", "\n".join(rows) + "\n")
+
+SCENARIOS = [
+  ("index", "GET", lambda rng, scale, n: ("/", None)),
+  ("candidate form", "GET", lambda rng, scale, n: ("/candidate", None)),
+  ("register candidate", "POST", lambda rng, scale, n: ("/candidate", {"first_name": "New", "last_name": "Cand", "email": "bench%d.%d@example.com" % (n, rng.randint(0, 10 ** 9)), "phone": "1"})),
+  ("findCandidate", "GET", lambda rng, scale, n: ("/findCandidate?email=candidate%d@example.com" % skewed(rng, scale.candidates), None)),
+  ("host form", "GET", lambda rng, scale, n: ("/host", None)),
+  ("register host", "POST", lambda rng, scale, n: ("/host", {"first_name": "New", "last_name": "Host", "organization": "Bench"})),
+  ("findHost", "GET", lambda rng, scale, n: ("/findHost?" + _host(rng, scale)[1], None)),
+  ("create event", "POST", lambda rng, scale, n: ("/event", {"host_id": str(skewed(rng, scale.hosts)), "date": random_date(rng), "time": random_time(rng),
+                                                             "description": "Bench event", "location": "Lab", "capacity": "10", "budget": "100"})),
+  ("invite", "POST", lambda rng, scale, n: ("/invite", {"host_id": str(skewed(rng, scale.hosts)), "company_id": str(rng.randint(1, scale.companys)), "event_id": str(rng.randint(1, scale.events))})),
+  ("deleteEvent", "GET", lambda rng, scale, n: ("/deleteEvent?event_id=%d&host_id=%d" % (scale.events + n % max(1, scale.disposable_events) + 1, skewed(rng, scale.hosts)), None)),
+  ("company form", "GET", lambda rng, scale, n: ("/company", None)),
+  ("register company", "POST", lambda rng, scale, n: ("/company", {"name": "Bench Co %d" % n, "description": "x", "location": "y"})),
+  ("findCompany", "GET", lambda rng, scale, n: ("/findCompany?name=Company %d" % skewed(rng, scale.companys), None)),
+  ("recruiter form", "GET", lambda rng, scale, n: ("/recruiter", None)),
+  ("register recruiter", "POST", lambda rng, scale, n: ("/recruiter", {"first_name": "New", "last_name": "Rec", "phone": "1", "email": "r@x", "title": "t", "company_id": str(rng.randint(1, scale.companys))})),
+  ("findRecruiter", "GET", lambda rng, scale, n: ("/findRecruiter?" + _recruiter(rng, scale), None)),
+  ("application form", "GET", lambda rng, scale, n: ("/application", None)),
+  ("create application", "POST", lambda rng, scale, n: ("/application", {"candidate_id": str(rng.randint(1, scale.candidates)), "position_id": str(rng.randint(1, scale.positions)), "resume": "Y"})),
+  ("findApplication all", "GET", lambda rng, scale, n: ("/findApplication?candidate_id=&position_id=", None)),
+  ("findApplication candidate", "GET", lambda rng, scale, n: ("/findApplication?candidate_id=%d&position_id=" % skewed(rng, scale.candidates), None)),
+  ("approveApplication", "POST", lambda rng, scale, n: ("/approveApplication", {"recruiter_id": str(rng.randint(1, scale.recruiters)), "application_id": str(rng.randint(1, scale.applications))})),
+  ("api candidates", "GET", lambda rng, scale, n: ("/api/candidates?email=candidate%d@example.com" % skewed(rng, scale.candidates), None)),
+  ("api hosts", "GET", lambda rng, scale, n: ("/api/hosts?" + _host(rng, scale)[1], None)),
+  ("api companys", "GET", lambda rng, scale, n: ("/api/companys?name=Company %d" % skewed(rng, scale.companys), None)),
+  ("api recruiters", "GET", lambda rng, scale, n: ("/api/recruiters?" + _recruiter(rng, scale), None)),
+  ("api applications", "GET", lambda rng, scale, n: ("/api/applications?after=%d" % rng.randint(0, scale.applications), None)),
+  ("api calendar", "GET", lambda rng, scale, n: ("/api/calendar?recruiter_id=%d&start=%d-01-01&end=%d-01-01" % (skewed(rng, scale.recruiters), 2024 + n % 2, 2025 + n % 2), None)),
+  ("bulk applications", "POST", _bulk_applications),
+  ("bulk candidates", "POST", _bulk_candidates),
+  # Host 1 organizes the most events (see skewed()), so some of the random ones are theirs to invite to.
+  ("batchInvite", "POST", lambda rng, scale, n: ("/batchInvite", {"host_id": "1", "company_ids": _ids(rng, scale.companys, 5), "event_ids": _ids(rng, scale.events, 10)})),
+  # Ids past the seeded events: the DELETE runs but leaves the deleteEvent scenario's events alone.
+  ("batchDeleteEvent", "POST", lambda rng, scale, n: ("/batchDeleteEvent", {"host_id": str(skewed(rng, scale.hosts)), "event_ids": "%d,%d" % (scale.events + scale.disposable_events + 1, 10 ** 9 + n)})),
+  ("search", "GET", lambda rng, scale, n: ("/search?q=company %d" % skewed(rng, scale.companys), None)),
+  ("api search prefix", "GET", lambda rng, scale, n: ("/api/search?q=rec%d" % skewed(rng, scale.recruiters), None)),
+  ("api search fuzzy", "GET", lambda rng, scale, n: ("/api/search?q=compnay %d" % skewed(rng, scale.companys), None)),
+  ("api analytics companys", "GET", lambda rng, scale, n: ("/api/analytics/companys?after=%d" % rng.randint(0, scale.companys), None)),
+  ("api analytics positions", "GET", lambda rng, scale, n: ("/api/analytics/positions?company_id=%d" % skewed(rng, scale.companys), None)),
+  ("api analytics recruiters", "GET", lambda rng, scale, n: ("/api/analytics/recruiters?company_id=%d" % skewed(rng, scale.companys), None)),
+  ("api analytics events", "GET", lambda rng, scale, n: ("/api/analytics/events?host_id=%d" % skewed(rng, scale.hosts), None)),
+]
+
+
+def percentile(values, p):
+  """
+  The p-th percentile of values (nearest-rank method).
+  """
+  ordered = sorted(values)
+  return ordered[max(0, int(math.ceil(p / 100.0 * len(ordered))) - 1)]
+
+
+def summarize(name, latencies, elapsed, errors, statements):
+  return {"route": name, "requests": len(latencies), "errors": errors,
+          "p50_ms": percentile(latencies, 50) * 1000, "p95_ms": percentile(latencies, 95) * 1000, "p99_ms": percentile(latencies, 99) * 1000,
+          "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+          "statements": statements / float(len(latencies)) if statements is not None else None}
+
+
+def client_args(data):
+  """
+  The keyword arguments of Flask's test client for scenario data.
+  """
+  if isinstance(data, tuple):
+    return {"content_type": data[0], "data": data[1]}
+  return {"data": data}
+
+
+def run_in_process(server, scenarios, scale, requests, rng):
+  """
+  Drives each scenario through Flask's test client, one request at a time,
+  counting the SQL statements each one issues.
+  """
+  counter = {"statements": 0}
+
+  def count(conn, cursor, statement, parameters, context, executemany):
+    counter["statements"] += 1
+  event.listen(server.engine, "before_cursor_execute", count)
+  client = server.app.test_client()
+  results = []
+  for name, method, make in scenarios:
+    latencies = []
+    errors = 0
+    counter["statements"] = 0
+    started = time.time()
+    for n in range(requests):
+      path, data = make(rng, scale, n)
+      start = time.time()
+      response = client.open(path, method=method, **client_args(data))
+      response.get_data()
+      latencies.append(time.time() - start)
+      if response.status_code >= 400:
+        errors += 1
+    results.append(summarize(name, latencies, time.time() - started, errors, counter["statements"]))
+  event.remove(server.engine, "before_cursor_execute", count)
+  return results
+
+
+def run_http(url, scenarios, scale, requests, rng, concurrency):
+  """
+  Drives each scenario against a running server with concurrency parallel
+  clients.
+  """
+  from urllib.request import urlopen, Request
+  from urllib.parse import urlencode, quote
+  from urllib.error import HTTPError
+
+  results = []
+  for name, method, make in scenarios:
+    calls = [make(rng, scale, n) for n in range(requests)]
+    lock = threading.Lock()
+    latencies = []
+    errors = [0]
+
+    def call(item):
+      path, data = item
+      headers = {}
+      if isinstance(data, tuple):
+        headers["Content-Type"] = data[0]
+        body = data[1].encode("utf-8")
+      else:
+        body = urlencode(data).encode("utf-8") if data is not None else None
+      start = time.time()
+      try:
+        with urlopen(Request(url.rstrip("/") + quote(path, safe="/?=&"), data=body, headers=headers), timeout=60) as response:
+          response.read()
+        failed = False
+      except HTTPError:
+        failed = True
+      with lock:
+        latencies.append(time.time() - start)
+        errors[0] += failed
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+      list(pool.map(call, calls))
+    results.append(summarize(name, latencies, time.time() - started, errors[0], None))
+  return results
+
+
+#
+# Large dashboards, rendered whole and streamed (?stream=1).  The seeded
+# data is skewed towards low ids, so these are the biggest pages.
+#
+DASHBOARDS = [
+  ("findHost", "/findHost?first_name=Host1&last_name=Ost1"),
+  ("findRecruiter", "/findRecruiter?first_name=Rec1&last_name=Ruiter1"),
+  ("findCompany", "/findCompany?name=Company 1"),
+  ("findApplication", "/findApplication?candidate_id=&position_id=&page_size=1000"),
+]
+
+
+def fetch_page(client, path):
+  """
+  Requests path and reads the response chunk by chunk.  Returns the time to
+  the first chunk, the total time and the size of the body.
+  """
+  start = time.time()
+  response = client.get(path, buffered=False)
+  chunks = response.iter_encoded()
+  size = len(next(chunks, b""))
+  first_byte = time.time() - start
+  for chunk in chunks:
+    size += len(chunk)
+  response.close()
+  return first_byte, time.time() - start, size
+
+
+def run_dashboards(server, requests):
+  """
+  Measures time to first byte, total time and peak Python memory (traced in
+  a separate run, as tracing slows everything down) of each dashboard,
+  rendered whole and streamed.
+  """
+  client = server.app.test_client()
+  results = []
+  for name, path in DASHBOARDS:
+    for mode, suffix in (("render", ""), ("stream", "&stream=1")):
+      timings = [fetch_page(client, path + suffix) for n in range(requests)]
+      tracemalloc.start()
+      before = tracemalloc.get_traced_memory()[0]
+      fetch_page(client, path + suffix)
+      peak = tracemalloc.get_traced_memory()[1] - before
+      tracemalloc.stop()
+      results.append({"route": name, "mode": mode, "requests": requests,
+                      "ttfb_p50_ms": percentile([t[0] for t in timings], 50) * 1000,
+                      "total_p50_ms": percentile([t[1] for t in timings], 50) * 1000,
+                      "peak_kb": peak / 1024.0, "bytes": timings[0][2]})
+  return results
+
+
+def print_dashboards(results):
+  click.echo("%-18s %-8s %12s %13s %10s %10s" % ("route", "mode", "ttfb p50 ms", "total p50 ms", "peak KB", "bytes"))
+  for r in results:
+    click.echo("%-18s %-8s %12.2f %13.2f %10.1f %10d" % (r["route"], r["mode"], r["ttfb_p50_ms"], r["total_p50_ms"], r["peak_kb"], r["bytes"]))
+  # ru_maxrss is in kilobytes on Linux.
+  click.echo("peak RSS of the process: %.1f MB" % (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0))
+
+
+def print_report(results):
+  click.echo("%-28s %8s %6s %9s %9s %9s %10s %8s" % ("route", "requests", "errors", "p50 ms", "p95 ms", "p99 ms", "req/s", "stmts"))
+  for r in results:
+    statements = "%.1f" % r["statements"] if r["statements"] is not None else "-"
+    click.echo("%-28s %8d %6d %9.2f %9.2f %9.2f %10.1f %8s" % (r["route"], r["requests"], r["errors"], r["p50_ms"], r["p95_ms"], r["p99_ms"], r["throughput"], statements))
+
+
+def compare(results, baseline, tolerance):
+  """
+  Returns the regressions of results against baseline: routes whose p95
+  grew by more than tolerance (a fraction), or that issue more statements
+  per request.
+  """
+  previous = dict((r["route"], r) for r in baseline)
+  regressions = []
+  for r in results:
+    before = previous.get(r["route"])
+    if before is None:
+      continue
+    if r["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+      regressions.append("%s: p95 %.2f ms -> %.2f ms" % (r["route"], before["p95_ms"], r["p95_ms"]))
+    if r["statements"] is not None and before.get("statements") is not None and r["statements"] > before["statements"] + 0.5:
+      regressions.append("%s: statements/request %.1f -> %.1f" % (r["route"], before["statements"], r["statements"]))
+  return regressions
+
+
+def prepare(database, applications, requests, random_seed, no_seed, apply_migrations=True):
+  """
+  Imports server.py against database (a new SQLite file if None), seeds it
+  unless no_seed and applies the schema migrations.  Returns the server
+  module, the Scale of the data and the random generator for the requests.
+  """
+  if database is None:
+    database = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bench"), "bench.db")
+  # server.py builds its engine from DATABASEURI when it is imported.
+  os.environ["DATABASEURI"] = database
+  sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+  import server
+  import migrate
+
+  if server.engine.dialect.name == "sqlite":
+    @event.listens_for(server.engine, "connect")
+    def enable_foreign_keys(dbapi_connection, connection_record):
+      dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+  rng = random.Random(random_seed)
+  scale = Scale(applications)
+  scale.disposable_events = requests
+  if not no_seed:
+    click.echo("seeding %s with %d applications ..." % (database, applications), err=True)
+    started = time.time()
+    create_schema(server.engine)
+    seed(server.engine, scale, rng, requests)
+    click.echo("seeded in %.1fs" % (time.time() - started), err=True)
+  if apply_migrations:
+    # Indexes are built after the bulk load, which is faster than
+    # maintaining them row by row.
+    migrate.migrate(server.engine, lambda line: click.echo(line, err=True))
+  if server.engine.dialect.name == "postgresql":
+    with server.engine.connect() as conn:
+      conn.execute("ANALYZE")
+  return server, scale, rng
+
+
+@click.command()
+@click.option('--database', help='Database URI to build and seed (default: a new SQLite file).')
+@click.option('--applications', default=10000, type=int, help='Number of applications to seed; other tables scale with it.')
+@click.option('--requests', default=100, type=int, help='Requests per scenario.')
+@click.option('--route', 'routes', multiple=True, help='Only run scenarios whose name contains this (repeatable).')
+@click.option('--seed', 'random_seed', default=4111, type=int, help='Random seed for data and requests.')
+@click.option('--no-seed', is_flag=True, help='Reuse the data already in --database.')
+@click.option('--seed-only', is_flag=True, help='Build and seed the database, then exit.')
+@click.option('--skip-migrations', is_flag=True, help='Do not apply migrations/ (e.g. to measure a run without the indexes).')
+@click.option('--dashboards', is_flag=True, help='Compare rendered and streamed large dashboards (TTFB, peak memory) instead.')
+@click.option('--url', help='Load test a running server at this URL instead of using the test client.')
+@click.option('--concurrency', default=8, type=int, help='Parallel clients with --url.')
+@click.option('--json', 'as_json', is_flag=True, help='Print the results as JSON instead of a table.')
+@click.option('--save', type=click.Path(), help='Write the results as JSON to this file.')
+@click.option('--baseline', type=click.Path(exists=True), help='Fail on regressions against results saved with --save.')
+@click.option('--tolerance', default=0.2, type=float, help='Allowed p95 growth against --baseline, as a fraction.')
+def main(database, applications, requests, routes, random_seed, no_seed, seed_only, skip_migrations, dashboards, url, concurrency, as_json, save, baseline, tolerance):
+  """
+  Seeds a local database and benchmarks every route of server.py.
+  """
+  server, scale, rng = prepare(database, applications, requests, random_seed, no_seed, not skip_migrations)
+  if seed_only:
+    return
+
+  if dashboards:
+    results = run_dashboards(server, requests)
+    if as_json:
+      click.echo(json.dumps(results, indent=2))
+    else:
+      print_dashboards(results)
+    return
+
+  scenarios = [s for s in SCENARIOS if not routes or any(r in s[0] for r in routes)]
+  if url:
+    results = run_http(url, scenarios, scale, requests, rng, concurrency)
+  else:
+    results = run_in_process(server, scenarios, scale, requests, rng)
+  if as_json:
+    click.echo(json.dumps(results, indent=2))
+  else:
+    print_report(results)
+  if save:
+    with open(save, "w") as f:
+      json.dump(results, f, indent=2)
+  if baseline:
+    with open(baseline) as f:
+      regressions = compare(results, json.load(f), tolerance)
+    for line in regressions:
+      click.echo("REGRESSION " + line, err=True)
+    if regressions:
+      sys.exit(1)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+"""
+Query plan check for server.py
+
+Seeds a database like bench.py (migrations included), drives every route
+once per scenario through Flask's test client while capturing the SQL they
+send (executemany included), then runs EXPLAIN on each distinct statement
+with the parameters it was sent with.  Endpoints that no bench.py scenario
+requests are listed at the end.  It fails if a statement reads a table of more than
+--min-rows rows with a sequential scan to filter it, i.e. a lookup the
+indexes do not serve:
+
+    python explain_check.py
+    python explain_check.py --database postgresql://localhost/bench --applications 100000
+
+On Postgres that is a Seq Scan plan node carrying a Filter.  On SQLite it
+is a "SCAN <table>" step without an index, for a table the WHERE clause
+compares with a bind parameter.  Statements without a WHERE clause (full
+listings such as the company list) are never flagged.
+"""
+
+import re
+import sys
+import json
+
+import click
+from sqlalchemy import event
+
+import bench
+
+
+def capture_statements(server, scenarios, scale, rng, requests):
+  """
+  Drives scenarios through the test client and returns the distinct
+  statements they executed as an ordered {statement: (parameters, route)}
+  (for an executemany, the parameters of its first row), and the endpoints
+  of the app that no scenario requested.
+  """
+  captured = {}
+
+  def capture(conn, cursor, statement, parameters, context, executemany):
+    if executemany:
+      parameters = parameters[0]
+    if statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"):
+      captured.setdefault(statement, (parameters, route[0]))
+  route = [None]
+  urls = server.app.url_map.bind("localhost")
+  requested = set()
+  event.listen(server.engine, "before_cursor_execute", capture)
+  client = server.app.test_client()
+  for name, method, make in scenarios:
+    route[0] = name
+    for n in range(requests):
+      path, data = make(rng, scale, n)
+      requested.add(urls.match(path.split("?")[0], method=method)[0])
+      client.open(path, method=method, **bench.client_args(data)).get_data()
+  event.remove(server.engine, "before_cursor_execute", capture)
+  missed = sorted(set(rule.endpoint for rule in server.app.url_map.iter_rules()) - requested)
+  return captured, missed
+
+
+def where_clause(statement):
+  match = re.search(r"\bWHERE\b(.*)", statement, re.I | re.S)
+  return match.group(1) if match else None
+
+
+def check_postgresql(cursor, statement, parameters, min_rows):
+  cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+  plan = cursor.fetchone()[0]
+  if isinstance(plan, str):
+    plan = json.loads(plan)
+  problems = []
+  nodes = [plan[0]["Plan"]]
+  while nodes:
+    node = nodes.pop()
+    nodes.extend(node.get("Plans", []))
+    if node["Node Type"] == "Seq Scan" and "Filter" in node:
+      cursor.execute("SELECT reltuples FROM pg_class WHERE oid = to_regclass(%(name)s)", {"name": node["Relation Name"]})
+      rows = cursor.fetchone()[0]
+      if rows > min_rows:
+        problems.append("Seq Scan on %s (%d rows) Filter: %s" % (node["Relation Name"], rows, node["Filter"]))
+  return problems, json.dumps(plan, indent=2)
+
+
+def check_sqlite(cursor, statement, parameters, min_rows):
+  cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+  steps = [row[3] for row in cursor.fetchall()]
+  where = where_clause(statement)
+  tables = [s for s in steps if re.match(r"(SCAN|SEARCH) ", s)]
+  problems = []
+  for step in steps:
+    match = re.match(r"SCAN (?:TABLE )?(\w+)(?: AS (\w+))?$", step)
+    if not match:
+      continue
+    names = [n for n in match.groups() if n]
+    compared = re.search(r"\b(?:%s)\.\w+\s*(?:=|<=?|>=?|<>|!=|\bIN\b|\bLIKE\b)\s*\(?\s*\?" % "|".join(names), where, re.I)
+    if not compared and not (len(tables) == 1 and "?" in where):
+      continue
+    cursor.execute("SELECT COUNT(*) FROM %s" % match.group(1))
+    rows = cursor.fetchone()[0]
+    if rows > min_rows:
+      problems.append("%s (%d rows)" % (step, rows))
+  return problems, "\n".join(steps)
+
+
+@click.command()
+@click.option('--database', help='Database URI to build and seed (default: a new SQLite file).')
+@click.option('--applications', default=10000, type=int, help='Number of applications to seed.')
+@click.option('--requests', default=3, type=int, help='Requests per scenario.')
+@click.option('--route', 'routes', multiple=True, help='Only run scenarios whose name contains this (repeatable).')
+@click.option('--no-seed', is_flag=True, help='Reuse the data already in --database.')
+@click.option('--min-rows', default=1000, type=int, help='Sequential scans of tables up to this many rows are allowed.')
+@click.option('--verbose', is_flag=True, help='Print the plan of every statement.')
+def main(database, applications, requests, routes, no_seed, min_rows, verbose):
+  """
+  Fails if a query of server.py filters a large table with a sequential scan.
+  """
+  server, scale, rng = bench.prepare(database, applications, requests, 4111, no_seed)
+  scenarios = [s for s in bench.SCENARIOS if not routes or any(r in s[0] for r in routes)]
+  captured, missed = capture_statements(server, scenarios, scale, rng, requests)
+  check = check_postgresql if server.engine.dialect.name == "postgresql" else check_sqlite
+
+  failures = 0
+  raw = server.engine.raw_connection()
+  try:
+    cursor = raw.cursor()
+    for statement, (parameters, route) in captured.items():
+      if where_clause(statement) is None:
+        continue
+      problems, plan = check(cursor, statement, parameters, min_rows)
+      if problems or verbose:
+        click.echo("-- %s\n%s\n%s\n" % (route, " ".join(statement.split()), plan))
+      for problem in problems:
+        click.echo("SEQUENTIAL SCAN " + problem + "\n", err=True)
+      failures += len(problems)
+  finally:
+    raw.rollback()
+    raw.close()
+  click.echo("%d statements checked, %d sequential scans" % (len(captured), failures), err=True)
+  if missed and not routes:
+    click.echo("endpoints no scenario requests (their SQL is not checked): " + ", ".join(missed), err=True)
+  if failures:
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+"""
+Schema migrations for server.py
+
+Applies the numbered SQL files in migrations/ that the database has not
+seen yet, in order, and records each one in a schema_migrations table:
+
+    python migrate.py                      # the database of DATABASEURI
+    python migrate.py --database sqlite:///local.db
+    python migrate.py --status             # list applied and pending migrations
+
+A migration whose first lines contain `-- requires: <dialect>` (e.g.
+postgresql) is skipped on other databases.  Statements are separated by
+`;` at the end of a line.
+"""
+
+import os
+import re
+import time
+
+import click
+from sqlalchemy import create_engine
+
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+
+class Migration(object):
+
+  def __init__(self, path):
+    self.path = path
+    self.version = os.path.basename(path)[:-len(".sql")]
+    with open(path) as f:
+      self.sql = f.read()
+    self.requires = set(re.findall(r"^--\s*requires:\s*(\w+)", self.sql, re.M))
+
+  def statements(self):
+    body = "\n".join(line for line in self.sql.splitlines() if not line.lstrip().startswith("--"))
+    return [s.strip() for s in re.split(r";\s*$", body, flags=re.M) if s.strip()]
+
+  def applies_to(self, dialect):
+    return not self.requires or dialect in self.requires
+
+
+def migrations():
+  """
+  All migrations in migrations/, oldest first.
+  """
+  names = sorted(n for n in os.listdir(MIGRATIONS_DIR) if re.match(r"\d+_.*\.sql$", n))
+  return [Migration(os.path.join(MIGRATIONS_DIR, n)) for n in names]
+
+
+def applied_versions(engine):
+  with engine.connect() as conn:
+    conn.execute("CREATE TABLE IF NOT EXISTS schema_migrations (version VARCHAR(200) PRIMARY KEY, applied_at TIMESTAMP NOT NULL)")
+    return set(r[0] for r in conn.execute("SELECT version FROM schema_migrations"))
+
+
+def pending(engine):
+  """
+  The migrations that apply to engine's database and have not been applied.
+  """
+  applied = applied_versions(engine)
+  return [m for m in migrations() if m.version not in applied and m.applies_to(engine.dialect.name)]
+
+
+def migrate(engine, echo=None):
+  """
+  Applies every pending migration, each one in its own transaction (where
+  the database supports transactional DDL), and returns their versions.
+  """
+  done = []
+  for m in pending(engine):
+    started = time.time()
+    # Statements go to the DBAPI cursor untouched, so % and : in them are
+    # not taken for bind parameters.
+    raw = engine.raw_connection()
+    try:
+      cursor = raw.cursor()
+      for statement in m.statements():
+        cursor.execute(statement)
+      cursor.execute("INSERT INTO schema_migrations (version, applied_at) VALUES ('%s', CURRENT_TIMESTAMP)" % m.version)
+      raw.commit()
+    except:
+      raw.rollback()
+      raise
+    finally:
+      raw.close()
+    done.append(m.version)
+    if echo:
+      echo("applied %s in %.1fs" % (m.version, time.time() - started))
+  return done
+
+
+@click.command()
+@click.option('--database', help='Database URI (default: DATABASEURI, as server.py).')
+@click.option('--status', is_flag=True, help='List the migrations instead of applying them.')
+def main(database, status):
+  """
+  Applies pending schema migrations.
+  """
+  if database is None:
+    database = os.environ.get("DATABASEURI")
+  if database is None:
+    from server import DATABASEURI as database
+  engine = create_engine(database)
+  if status:
+    applied = applied_versions(engine)
+    for m in migrations():
+      if m.version in applied:
+        state = "applied"
+      elif m.applies_to(engine.dialect.name):
+        state = "pending"
+      else:
+        state = "skipped (requires %s)" % ", ".join(sorted(m.requires))
+      click.echo("%-40s %s" % (m.version, state))
+    return
+  if not migrate(engine, click.echo):
+    click.echo("nothing to apply")
+
+
+if __name__ == "__main__":
+  main()
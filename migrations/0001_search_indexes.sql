@@ -0,0 +1,15 @@
+-- Expression indexes on the lower()-cased keys /search and /api/search
+-- match on (see SEARCH_KINDS in server.py).  Prefix searches on databases
+-- other than Postgres are range predicates on these expressions.
+
+CREATE INDEX IF NOT EXISTS companys_name_lower ON Companys (lower(name));
+
+CREATE INDEX IF NOT EXISTS candidates_email_lower ON Candidates (lower(email));
+CREATE INDEX IF NOT EXISTS candidates_full_name_lower ON Candidates (lower(first_name || ' ' || last_name));
+CREATE INDEX IF NOT EXISTS candidates_last_name_lower ON Candidates (lower(last_name));
+
+CREATE INDEX IF NOT EXISTS hosts_full_name_lower ON Hosts (lower(first_name || ' ' || last_name));
+CREATE INDEX IF NOT EXISTS hosts_last_name_lower ON Hosts (lower(last_name));
+
+CREATE INDEX IF NOT EXISTS recruiters_full_name_lower ON Recruiters (lower(first_name || ' ' || last_name));
+CREATE INDEX IF NOT EXISTS recruiters_last_name_lower ON Recruiters (lower(last_name));
@@ -0,0 +1,27 @@
+-- requires: postgresql
+--
+-- Postgres indexes for /search: text_pattern_ops b-trees serve
+-- lower(key) LIKE 'prefix%' whatever the database collation, and pg_trgm
+-- GIN indexes serve the typo-tolerant lower(key) % 'query' matches.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS companys_name_prefix ON Companys (lower(name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS companys_name_trgm ON Companys USING gin (lower(name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS candidates_email_prefix ON Candidates (lower(email) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS candidates_email_trgm ON Candidates USING gin (lower(email) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS candidates_full_name_prefix ON Candidates (lower(first_name || ' ' || last_name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS candidates_full_name_trgm ON Candidates USING gin (lower(first_name || ' ' || last_name) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS candidates_last_name_prefix ON Candidates (lower(last_name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS candidates_last_name_trgm ON Candidates USING gin (lower(last_name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS hosts_full_name_prefix ON Hosts (lower(first_name || ' ' || last_name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS hosts_full_name_trgm ON Hosts USING gin (lower(first_name || ' ' || last_name) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS hosts_last_name_prefix ON Hosts (lower(last_name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS hosts_last_name_trgm ON Hosts USING gin (lower(last_name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS recruiters_full_name_prefix ON Recruiters (lower(first_name || ' ' || last_name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS recruiters_full_name_trgm ON Recruiters USING gin (lower(first_name || ' ' || last_name) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS recruiters_last_name_prefix ON Recruiters (lower(last_name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS recruiters_last_name_trgm ON Recruiters USING gin (lower(last_name) gin_trgm_ops);
@@ -0,0 +1,21 @@
+-- Indexes on the foreign-key columns the dashboards, find* routes and
+-- guarded writes look rows up by.  A composite primary key only serves
+-- lookups on its leading column, so both columns of Approves get one.
+
+CREATE INDEX IF NOT EXISTS applications_candidate_id ON Applications (candidate_id);
+CREATE INDEX IF NOT EXISTS applications_position_id ON Applications (position_id);
+CREATE INDEX IF NOT EXISTS organizes_host_id ON Organizes (host_id);
+CREATE INDEX IF NOT EXISTS approves_recruiter_id ON Approves (recruiter_id);
+CREATE INDEX IF NOT EXISTS approves_application_id ON Approves (application_id);
+CREATE INDEX IF NOT EXISTS invites_company_id ON invites (company_id);
+CREATE INDEX IF NOT EXISTS attends_candidate_id ON Attends (candidate_id);
+CREATE INDEX IF NOT EXISTS recruiters_company_id ON Recruiters (company_id);
+CREATE INDEX IF NOT EXISTS positions_company_id ON Positions (company_id);
+CREATE INDEX IF NOT EXISTS interviews_application_id ON interviews (application_id);
+CREATE INDEX IF NOT EXISTS interviews_recruiter_id ON interviews (recruiter_id);
+
+-- The exact-name lookups of findHost, findRecruiter and findCompany
+-- (findCandidate's email is UNIQUE, hence already indexed).
+CREATE INDEX IF NOT EXISTS hosts_name ON Hosts (first_name, last_name);
+CREATE INDEX IF NOT EXISTS recruiters_name ON Recruiters (first_name, last_name);
+CREATE INDEX IF NOT EXISTS companys_name ON Companys (name);
@@ -0,0 +1,55 @@
+-- Aggregate counts behind /api/analytics, one row per position, recruiter,
+-- company and event, kept up to date by the write routes (see
+-- count_stats() in server.py) and backfilled here from the existing rows.
+-- A position, company, recruiter or event without a row has counted
+-- nothing yet.  A recruiter's company_approvals counts only their
+-- approvals of applications to their own company's positions.
+
+CREATE TABLE IF NOT EXISTS position_stats (
+  position_id INTEGER PRIMARY KEY REFERENCES Positions(id) ON DELETE CASCADE,
+  applications INTEGER NOT NULL DEFAULT 0,
+  approvals INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS company_stats (
+  company_id INTEGER PRIMARY KEY REFERENCES Companys(id) ON DELETE CASCADE,
+  applications INTEGER NOT NULL DEFAULT 0,
+  approvals INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS recruiter_stats (
+  recruiter_id INTEGER PRIMARY KEY REFERENCES Recruiters(id) ON DELETE CASCADE,
+  approvals INTEGER NOT NULL DEFAULT 0,
+  company_approvals INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS event_stats (
+  event_id INTEGER PRIMARY KEY REFERENCES Events(id) ON DELETE CASCADE,
+  invited INTEGER NOT NULL DEFAULT 0,
+  attending INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT INTO position_stats (position_id, applications, approvals)
+SELECT Positions.id, COALESCE(apps.n, 0), COALESCE(approved.n, 0)
+FROM Positions
+LEFT JOIN (SELECT position_id, COUNT(*) AS n FROM Applications GROUP BY position_id) apps ON apps.position_id = Positions.id
+LEFT JOIN (SELECT Applications.position_id, COUNT(*) AS n FROM Approves JOIN Applications ON Applications.id = Approves.application_id
+           GROUP BY Applications.position_id) approved ON approved.position_id = Positions.id
+WHERE apps.n IS NOT NULL OR approved.n IS NOT NULL;
+
+INSERT INTO company_stats (company_id, applications, approvals)
+SELECT Positions.company_id, SUM(position_stats.applications), SUM(position_stats.approvals)
+FROM position_stats JOIN Positions ON Positions.id = position_stats.position_id
+GROUP BY Positions.company_id;
+
+INSERT INTO recruiter_stats (recruiter_id, approvals, company_approvals)
+SELECT Approves.recruiter_id, COUNT(*), SUM(CASE WHEN Positions.company_id = Recruiters.company_id THEN 1 ELSE 0 END)
+FROM Approves
+JOIN Recruiters ON Recruiters.id = Approves.recruiter_id
+JOIN Applications ON Applications.id = Approves.application_id
+JOIN Positions ON Positions.id = Applications.position_id
+GROUP BY Approves.recruiter_id;
+
+INSERT INTO event_stats (event_id, invited, attending)
+SELECT Events.id, COALESCE(invited.n, 0), COALESCE(attending.n, 0)
+FROM Events
+LEFT JOIN (SELECT event_id, COUNT(*) AS n FROM invites GROUP BY event_id) invited ON invited.event_id = Events.id
+LEFT JOIN (SELECT event_id, COUNT(*) AS n FROM Attends GROUP BY event_id) attending ON attending.event_id = Events.id
+WHERE invited.n IS NOT NULL OR attending.n IS NOT NULL;
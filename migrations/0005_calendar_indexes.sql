@@ -0,0 +1,13 @@
+-- Composite indexes behind /api/calendar: each subject's interviews and
+-- events are found by their foreign key and read in date order, so only
+-- the rows inside the requested window are touched.  The new interviews
+-- indexes lead with the columns of the single-column ones of
+-- 0003_lookup_indexes, which they replace.
+
+CREATE INDEX IF NOT EXISTS interviews_recruiter_date ON interviews (recruiter_id, date, id);
+CREATE INDEX IF NOT EXISTS interviews_application_date ON interviews (application_id, date, id);
+DROP INDEX IF EXISTS interviews_recruiter_id;
+DROP INDEX IF EXISTS interviews_application_id;
+
+-- Events in a date range, for subjects invited to or attending many events.
+CREATE INDEX IF NOT EXISTS events_date ON Events (date, id);
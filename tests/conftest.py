@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def server():
+  """
+  server.py running against a new SQLite database seeded by bench.py, with
+  every migration applied.
+  """
+  import bench
+  server, scale, rng = bench.prepare(None, 500, 5, 4111, False)
+  return server
+
+
+@pytest.fixture
+def client(server):
+  return server.app.test_client()
+
+
+@pytest.fixture
+def conn(server):
+  with server.engine.connect() as conn:
+    yield conn
@@ -0,0 +1,43 @@
+from sqlalchemy import exc
+
+EXPENSIVE = "/api/companys?name=Company 1"
+CHEAP = "/api/applications?position_id=1"
+
+
+def assert_shed(client, server, path, reason):
+  response = client.get(path)
+  assert response.status_code == 503
+  assert response.headers["Retry-After"] == str(server.ADMISSION_RETRY_AFTER)
+  assert 'reason="%s"' % reason in client.get("/metrics").get_data(as_text=True)
+
+
+def test_expensive_watermark(client, server, monkeypatch):
+  monkeypatch.setattr(server, "ADMISSION_EXPENSIVE_WATERMARK", 0)
+  assert_shed(client, server, EXPENSIVE, "expensive_watermark")
+  assert client.get(CHEAP).status_code == 200
+
+
+def test_in_flight(client, server, monkeypatch):
+  monkeypatch.setattr(server, "ADMISSION_MAX_IN_FLIGHT", 0)
+  assert_shed(client, server, CHEAP, "in_flight")
+
+
+def test_route_limit(client, server, monkeypatch):
+  monkeypatch.setattr(server, "admission", server.Admission())
+  monkeypatch.setattr(server, "ADMISSION_EXPENSIVE_ROUTE_LIMIT", 1)
+  monkeypatch.setattr(server, "ADMISSION_WAIT_SECONDS", 0)
+  assert server.admission.admit("api_companys", True) is None
+  assert_shed(client, server, EXPENSIVE, "route_limit")
+  # Other routes still have their slots.
+  assert client.get(CHEAP).status_code == 200
+  server.admission.release("api_companys", True)
+  assert client.get(EXPENSIVE).status_code == 200
+  assert server.admission.in_flight() == (0, 0)
+
+
+def test_pool_timeout(client, server, monkeypatch):
+  def get_conn():
+    raise exc.TimeoutError("QueuePool limit reached")
+  monkeypatch.setattr(server, "get_conn", get_conn)
+  assert_shed(client, server, EXPENSIVE, "pool_timeout")
+  assert server.admission.in_flight() == (0, 0)
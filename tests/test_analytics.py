@@ -0,0 +1,64 @@
+from sqlalchemy import text
+
+import migrate
+
+
+def counted(conn):
+  """The applications and approvals of position_stats, and those counted by GROUP BY."""
+  stats = conn.execute(text("SELECT position_id, applications, approvals FROM position_stats WHERE applications > 0 OR approvals > 0 ORDER BY position_id")).fetchall()
+  grouped = conn.execute(text("""
+    SELECT Applications.position_id, COUNT(DISTINCT Applications.id), COUNT(Approves.application_id)
+    FROM Applications LEFT JOIN Approves ON Approves.application_id = Applications.id
+    GROUP BY Applications.position_id ORDER BY Applications.position_id""")).fetchall()
+  return [tuple(r) for r in stats], [tuple(r) for r in grouped]
+
+
+def test_writes_without_stats_tables(client, server, conn, monkeypatch):
+  monkeypatch.setattr(server, "stats_tables_found", {})
+  for table in server.STATS_TABLES:
+    conn.execute(text("DROP TABLE %s" % table))
+  try:
+    response = client.post("/application", data={"candidate_id": "1", "position_id": "1", "resume": "Y"})
+    assert response.status_code == 200 and b"Error" not in response.data
+    application_id = conn.execute(text("SELECT MAX(id) FROM Applications")).first()[0]
+    response = client.post("/approveApplication", data={"recruiter_id": "1", "application_id": str(application_id)})
+    assert response.status_code == 200 and b"not exists" not in response.data
+    response = client.get("/api/analytics/positions")
+    assert response.status_code == 503 and "migrate.py" in response.get_json()["error"]
+  finally:
+    conn.execute(text("DELETE FROM schema_migrations WHERE version = '0004_analytics_stats'"))
+    migrate.migrate(server.engine)
+  # The backfill counted the writes made while the tables were missing.
+  stats, grouped = counted(conn)
+  assert stats == grouped
+  assert client.get("/api/analytics/positions").status_code == 200
+
+
+def test_approval_rate_counts_own_company_only(client, conn):
+  recruiter = conn.execute(text("SELECT id, company_id FROM Recruiters ORDER BY id")).first()
+  # Approve every application to another company's positions.
+  others = conn.execute(text("""
+    SELECT Applications.id FROM Applications JOIN Positions ON Positions.id = Applications.position_id
+    WHERE Positions.company_id != :company_id
+      AND Applications.id NOT IN (SELECT application_id FROM Approves WHERE recruiter_id = :recruiter_id)
+    ORDER BY Applications.id LIMIT 20"""), company_id=recruiter.company_id, recruiter_id=recruiter.id).fetchall()
+  assert others
+  for application in others:
+    client.post("/approveApplication", data={"recruiter_id": str(recruiter.id), "application_id": str(application.id)})
+  records = client.get("/api/analytics/recruiters?page_size=1000").get_json()["results"]
+  assert all(r["approval_rate"] is None or 0 <= r["approval_rate"] <= 1 for r in records)
+  expected = conn.execute(text("""
+    SELECT Approves.recruiter_id, COUNT(*), SUM(CASE WHEN Positions.company_id = Recruiters.company_id THEN 1 ELSE 0 END)
+    FROM Approves JOIN Recruiters ON Recruiters.id = Approves.recruiter_id
+    JOIN Applications ON Applications.id = Approves.application_id JOIN Positions ON Positions.id = Applications.position_id
+    GROUP BY Approves.recruiter_id ORDER BY Approves.recruiter_id""")).fetchall()
+  stats = conn.execute(text("SELECT recruiter_id, approvals, company_approvals FROM recruiter_stats WHERE approvals > 0 ORDER BY recruiter_id")).fetchall()
+  assert [tuple(r) for r in stats] == [tuple(r) for r in expected]
+
+
+def test_invalid_filter(client):
+  for path in ["/api/analytics/positions?company_id=abc", "/api/analytics/events?host_id=1.5", "/api/analytics/companys?after=x",
+               "/api/analytics/positions?company_id=99999999999999999999999", "/api/analytics/recruiters?after=-99999999999999999999"]:
+    response = client.get(path)
+    assert response.status_code == 400 and "integer" in response.get_json()["error"]
+  assert client.get("/api/analytics/positions?company_id=1").status_code == 200
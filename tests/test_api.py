@@ -0,0 +1,27 @@
+import json
+
+import pytest
+
+
+def ndjson(client, path):
+  response = client.get(path, headers={"Accept": "application/x-ndjson"})
+  assert response.status_code == 200 and response.mimetype == "application/x-ndjson"
+  return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+@pytest.mark.parametrize("path", [
+  "/api/candidates?email=candidate1@example.com",
+  "/api/hosts?first_name=Host1&last_name=Ost1",
+  "/api/companys?name=Company 1",
+  "/api/recruiters?first_name=Rec1&last_name=Ruiter1",
+])
+def test_ndjson_streams_the_same_records(client, server, path):
+  records = client.get(path).get_json()["results"]
+  assert records
+  assert ndjson(client, path) == records
+  # The stream held its connection until it was sent, then gave it back.
+  assert server.engine.pool.checkedout() == 0
+
+
+def test_ndjson_no_match(client):
+  assert ndjson(client, "/api/recruiters?first_name=No&last_name=Body") == []
@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import text
+
+
+def host_events(conn):
+  """Returns (host_id, event_id) of an event and of an event of another host."""
+  rows = conn.execute(text("SELECT host_id, event_id FROM Organizes ORDER BY event_id")).fetchall()
+  mine = rows[0]
+  other = next(r for r in rows if r.host_id != mine.host_id)
+  return mine, other
+
+
+@pytest.mark.parametrize("path", ["/batchInvite", "/batchDeleteEvent"])
+@pytest.mark.parametrize("host_id", [None, "", "abc", "99999"])
+def test_bad_host(client, server, path, host_id):
+  form = {"company_ids": "1", "event_ids": "1"}
+  if host_id is not None:
+    form["host_id"] = host_id
+  response = client.post(path + "?format=json", data=form)
+  assert response.status_code == 400
+  assert "Host id invalid. Host not exists." in response.get_json()["error"]
+  response = client.post(path, data=form)
+  assert response.status_code == 200
+  assert b"Host id invalid. Host not exists." in response.data
+  assert server.engine.pool.checkedout() == 0
+
+
+def test_invite_skips_events_of_other_hosts(client, conn):
+  mine, other = host_events(conn)
+  company_id = conn.execute(text("SELECT id FROM Companys ORDER BY id")).first()[0]
+  conn.execute(text("DELETE FROM invites WHERE company_id = :c AND event_id IN (:a, :b)"), c=company_id, a=mine.event_id, b=other.event_id)
+  form = {"host_id": mine.host_id, "company_ids": str(company_id), "event_ids": "%d %d" % (mine.event_id, other.event_id)}
+  summary = client.post("/batchInvite?format=json", data=form).get_json()
+  assert summary["invited"] == [{"event_id": mine.event_id, "company_id": company_id}]
+  assert summary["missing_events"] == [other.event_id]
+  assert summary["already_invited"] == 0
+  assert "Not events of this host: %d." % other.event_id in summary["message"]
+  invited = conn.execute(text("SELECT event_id FROM invites WHERE company_id = :c AND event_id IN (:a, :b)"), c=company_id, a=mine.event_id, b=other.event_id).fetchall()
+  assert [r[0] for r in invited] == [mine.event_id]
+
+
+def test_delete_skips_events_of_other_hosts(client, conn):
+  mine, other = host_events(conn)
+  form = {"host_id": mine.host_id, "event_ids": str(other.event_id)}
+  summary = client.post("/batchDeleteEvent?format=json", data=form).get_json()
+  assert summary["deleted"] == [] and summary["not_found"] == [other.event_id]
+  assert conn.execute(text("SELECT id FROM Events WHERE id = :id"), id=other.event_id).first() is not None
+
+
+@pytest.mark.parametrize("path, form, error", [
+  ("/batchInvite", {"company_ids": "", "event_ids": "1"}, "Invite failed. Company id invalid. Company not exists."),
+  ("/batchInvite", {"company_ids": "1", "event_ids": " , "}, "Invite failed. Event id invalid. Event not exists."),
+  ("/batchInvite", {"company_ids": "1"}, "Invite failed. Event id invalid. Event not exists."),
+  ("/batchDeleteEvent", {"event_ids": ""}, "Delete failed. Event id invalid. Event not exists."),
+])
+def test_missing_ids(client, conn, path, form, error):
+  mine, other = host_events(conn)
+  form = dict(form, host_id=mine.host_id)
+  response = client.post(path + "?format=json", data=form)
+  assert response.status_code == 400 and response.get_json()["error"] == error
+  assert error.encode() in client.post(path, data=form).data
+
+
+def test_out_of_range_ids(client, conn):
+  mine, other = host_events(conn)
+  huge = "99999999999999999999999"
+  response = client.post("/batchInvite?format=json", data={"host_id": huge, "company_ids": "1", "event_ids": "1"})
+  assert response.status_code == 400
+  summary = client.post("/batchInvite?format=json", data={"host_id": mine.host_id, "company_ids": "1 " + huge, "event_ids": "%d -%s" % (mine.event_id, huge)}).get_json()
+  assert summary["invalid"] == [huge, "-" + huge]
+  summary = client.post("/batchDeleteEvent?format=json", data={"host_id": mine.host_id, "event_ids": huge}).get_json()
+  assert summary["error"] == "Delete failed. Event id invalid. Event not exists."
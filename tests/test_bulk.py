@@ -0,0 +1,88 @@
+import json
+
+
+def bulk(client, kind, body, content_type):
+  response = client.post("/bulk/" + kind, data=body, content_type=content_type)
+  assert response.status_code == 200
+  return response.get_json()
+
+
+def test_csv_with_byte_order_mark(client):
+  body = u"﻿first_name,last_name,email,phone\nAda,Bom,ada.bom@example.com,1\n".encode("utf-8")
+  summary = bulk(client, "candidates", body, "text/csv")
+  assert summary["inserted"] == 1 and summary["errors"] == []
+
+
+def test_invalid_utf8_fails_only_its_row(client):
+  body = b"first_name,last_name,email,phone\nBad\xff,Row,bad.utf8@example.com,1\nGood,Row,good.utf8@example.com,1\n"
+  summary = bulk(client, "candidates", body, "text/csv")
+  assert summary["inserted"] == 1
+  assert summary["errors"] == [{"line": 2, "error": "Invalid UTF-8. Please save the file as UTF-8."}]
+
+  body = b'{"first_name": "Bad\xff", "last_name": "Row"}\n{"first_name": "Good", "last_name": "Row", "email": "good.ndjson@example.com"}\n'
+  summary = bulk(client, "candidates", body, "application/x-ndjson")
+  assert summary["inserted"] == 1
+  assert [e["line"] for e in summary["errors"]] == [1]
+
+
+def test_json_array(client):
+  rows = [{"name": "Array Co %d" % i, "description": "d", "location": "l"} for i in range(3)] + ["not an object"]
+  summary = bulk(client, "companys", json.dumps(rows), "application/json")
+  assert summary["rows"] == 4 and summary["inserted"] == 3
+  assert summary["errors"] == [{"line": 4, "error": "Malformed row."}]
+
+  summary = bulk(client, "companys", "{not json", "application/json")
+  assert summary["inserted"] == 0 and summary["failed"] == 1
+
+
+def test_errors_in_line_order(client):
+  # Line 2 fails the reference check (reported when the batch is flushed),
+  # line 3 fails validation (reported as it is read).
+  body = "candidate_id,position_id,resume\n1,999999,Y\n1,1,X\n1,1,Y\n"
+  summary = bulk(client, "applications", body, "text/csv")
+  assert summary["inserted"] == 1
+  assert [e["line"] for e in summary["errors"]] == [2, 3]
+
+
+def test_application_dates_only_on_bulk(client, conn):
+  summary = bulk(client, "applications", "candidate_id,position_id,resume,date\n2,2,Y,2001-02-03\n", "text/csv")
+  assert summary["inserted"] == 1
+  assert conn.execute("SELECT COUNT(*) FROM Applications WHERE date = '2001-02-03'").scalar() == 1
+
+  client.post("/application", data={"candidate_id": "3", "position_id": "3", "resume": "Y", "date": "2001-02-04"})
+  assert conn.execute("SELECT COUNT(*) FROM Applications WHERE date = '2001-02-04'").scalar() == 0
+  assert conn.execute("SELECT COUNT(*) FROM Applications WHERE candidate_id = 3 AND position_id = 3").scalar() >= 1
+
+
+def test_nested_values_are_malformed(client):
+  rows = [{"name": {"first": "Nested"}, "description": "d"}, {"name": "Listed Co", "location": ["a", "b"]}, {"name": "Flat Co"}]
+  summary = bulk(client, "companys", json.dumps(rows), "application/json")
+  assert summary["inserted"] == 1
+  assert summary["errors"] == [{"line": 1, "error": "Malformed row."}, {"line": 2, "error": "Malformed row."}]
+  body = "\n".join(json.dumps(row) for row in rows)
+  summary = bulk(client, "companys", body, "application/x-ndjson")
+  assert summary["inserted"] == 1 and [e["line"] for e in summary["errors"]] == [1, 2]
+
+
+def test_failed_import_still_bumps_the_table_version(client, server, monkeypatch):
+  insert_batch = server.insert_batch
+  calls = []
+
+  def failing_insert_batch(*args):
+    calls.append(1)
+    if len(calls) > 1:
+      raise RuntimeError("database went away")
+    return insert_batch(*args)
+  monkeypatch.setattr(server, "BULK_BATCH_SIZE", 1)
+  monkeypatch.setattr(server, "insert_batch", failing_insert_batch)
+  before = server.tables_version(("Companys",))[0]
+  body = "name,description,location\nFirst Batch Co,d,l\nSecond Batch Co,d,l\n"
+  assert client.post("/bulk/companys", data=body, content_type="text/csv").status_code == 500
+  assert server.tables_version(("Companys",))[0] != before
+
+
+def test_out_of_range_ids(client):
+  body = "candidate_id,position_id,resume\n99999999999999999999999,1,Y\n1,-99999999999999999999,Y\n1,1,Y\n"
+  summary = bulk(client, "applications", body, "text/csv")
+  assert summary["inserted"] == 1
+  assert [e["line"] for e in summary["errors"]] == [2, 3]
@@ -0,0 +1,47 @@
+import pytest
+
+WINDOW = "start=2024-01-01&end=2025-01-01"
+
+
+def busiest(client):
+  """The /api/calendar path of the company with the most items in WINDOW, and its items."""
+  calendars = []
+  for company_id in range(1, 6):
+    path = "/api/calendar?company_id=%d&%s" % (company_id, WINDOW)
+    calendars.append((client.get(path + "&page_size=1000").get_json()["results"], path))
+  items, path = max(calendars, key=lambda c: len(c[0]))
+  return path, items
+
+
+def test_pages_add_up_to_one_page(client):
+  path, items = busiest(client)
+  assert len(items) > 3
+  assert [i["kind"] for i in items].count("interview") and [i["kind"] for i in items].count("event")
+  keys = [(i["date"], i["kind"], i["id"]) for i in items]
+  assert keys == sorted(keys)
+  assert all("2024-01-01" <= i["date"] < "2025-01-01" for i in items)
+  paged = []
+  after = ""
+  while after is not None:
+    body = client.get("%s&page_size=3&after=%s" % (path, after)).get_json()
+    assert len(body["results"]) <= 3
+    paged += body["results"]
+    after = body["next_after"]
+  assert paged == items
+
+
+@pytest.mark.parametrize("query", [
+  "",
+  "company_id=1&recruiter_id=1",
+  "company_id=x",
+  "company_id=1&start=2024-13-01",
+  "company_id=1&start=2024-02-01&end=2024-01-01",
+  "company_id=1&start=2020-01-01&end=2024-01-01",
+  "company_id=1&after=2024-01-01,event",
+  "company_id=99999999999999999999999",
+  "recruiter_id=-99999999999999999999",
+  "company_id=1&after=2024-01-01,event,99999999999999999999999",
+])
+def test_bad_arguments(client, query):
+  response = client.get("/api/calendar?" + query)
+  assert response.status_code == 400 and response.get_json()["error"]
@@ -0,0 +1,31 @@
+from werkzeug.http import http_date
+
+PATH = "/findCompany?name=Company 2"
+
+
+def test_etag_answers_304_until_a_write(client, server):
+  etag = client.get(PATH).headers["ETag"]
+  assert client.get(PATH, headers={"If-None-Match": etag}).status_code == 304
+  server.tables_changed("Companys")
+  response = client.get(PATH, headers={"If-None-Match": etag})
+  assert response.status_code == 200 and response.headers["ETag"] != etag
+
+
+def test_write_in_the_same_second_is_not_hidden(client, server, monkeypatch):
+  # Ahead of the real clock, hence of the app's start (BOOT_TIME).
+  second = int(server.clock.time()) + 1000
+  now = [second + 0.2]
+  monkeypatch.setattr(server.clock, "time", lambda: now[0])
+  server.tables_changed("Companys")
+  # Still within the second of the write: no Last-Modified to revalidate with.
+  assert "Last-Modified" not in client.get(PATH).headers
+  assert client.get(PATH, headers={"If-Modified-Since": http_date(second)}).status_code == 200
+
+  now[0] = second + 1.5
+  last_modified = client.get(PATH).headers["Last-Modified"]
+  assert last_modified == http_date(second)
+  assert client.get(PATH, headers={"If-Modified-Since": last_modified}).status_code == 304
+
+  now[0] = second + 1.7
+  server.tables_changed("Companys")
+  assert client.get(PATH, headers={"If-Modified-Since": last_modified}).status_code == 200
@@ -0,0 +1,27 @@
+from sqlalchemy import text
+
+
+def approve(client, recruiter_id, application_id):
+  return client.post("/approveApplication", data={"recruiter_id": recruiter_id, "application_id": application_id}).get_data(as_text=True)
+
+
+def test_approve_messages(client, conn):
+  application_id = conn.execute(text("SELECT MAX(id) FROM Applications")).first()[0]
+  conn.execute(text("DELETE FROM Approves WHERE recruiter_id = 2 AND application_id = :id"), id=application_id)
+  assert "Invalid recruiter id. Recruiter not exists" in approve(client, "99999", str(application_id))
+  assert "Invalid recruiter id. Recruiter not exists" in approve(client, "", str(application_id))
+  assert "Invalid application id. application not exists" in approve(client, "2", "99999")
+  page = approve(client, "2", str(application_id))
+  assert "not exists" not in page and "already approved" not in page
+  assert "Application already approved by this recruiter." in approve(client, "2", str(application_id))
+  approvals = conn.execute(text("SELECT COUNT(*) FROM Approves WHERE recruiter_id = 2 AND application_id = :id"), id=application_id).first()[0]
+  assert approvals == 1
+
+
+def test_application_messages(client, conn):
+  before = conn.execute(text("SELECT COUNT(*) FROM Applications")).first()[0]
+  page = client.post("/application", data={"candidate_id": "99999", "position_id": "1", "resume": "Y"}).get_data(as_text=True)
+  assert "Candidate id invalid. Candidate not exists." in page
+  page = client.post("/application", data={"candidate_id": "1", "position_id": "99999", "resume": "Y"}).get_data(as_text=True)
+  assert "Position id invalid. Position not exists." in page
+  assert conn.execute(text("SELECT COUNT(*) FROM Applications")).first()[0] == before
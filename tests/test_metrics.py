@@ -0,0 +1,29 @@
+import re
+
+import pytest
+
+
+def rows_total(client, route):
+  match = re.search(r'^db_rows_total\{route="%s"\} (\d+)' % re.escape(route), client.get("/metrics").get_data(as_text=True), re.M)
+  return int(match.group(1)) if match else 0
+
+
+@pytest.mark.parametrize("route, path, ndjson", [
+  ("/findHost", "/findHost?first_name=Host1&last_name=Ost1", False),
+  ("/api/applications", "/api/applications?position_id=1&page_size=5", False),
+  ("/api/applications", "/api/applications?position_id=1", True),
+  ("/api/hosts", "/api/hosts?first_name=Host1&last_name=Ost1", True),
+])
+def test_rows_counted_as_read(client, route, path, ndjson):
+  before = rows_total(client, route)
+  headers = {"Accept": "application/x-ndjson"} if ndjson else {}
+  assert client.get(path, headers=headers).status_code == 200
+  assert rows_total(client, route) > before
+
+
+def test_statements_and_rows_of_a_page(client):
+  before = rows_total(client, "/api/applications")
+  body = client.get("/api/applications?page_size=5").get_json()
+  assert len(body["results"]) == 5 and body["next_after"] is not None
+  # The five rows of the page and the one that tells there is a next page.
+  assert rows_total(client, "/api/applications") == before + 6
@@ -0,0 +1,26 @@
+def pages(client, path, page_size):
+  """Follows next_after from the first page to the last and returns every result."""
+  results = []
+  after = ""
+  while after is not None:
+    body = client.get("%s&page_size=%d&after=%s" % (path, page_size, after)).get_json()
+    assert len(body["results"]) <= page_size
+    results += body["results"]
+    after = body["next_after"]
+  return results
+
+
+def test_pages_add_up_to_one_page(client):
+  path = "/api/applications?position_id=1"
+  everything = client.get(path + "&page_size=1000").get_json()
+  assert everything["next_after"] is None and len(everything["results"]) > 7
+  assert pages(client, path, 7) == everything["results"]
+  ids = [a["id"] for a in everything["results"]]
+  assert ids == sorted(ids)
+
+
+def test_last_full_page_has_no_next(client):
+  path = "/api/applications?position_id=1"
+  count = len(client.get(path + "&page_size=1000").get_json()["results"])
+  body = client.get(path + "&page_size=%d" % count).get_json()
+  assert len(body["results"]) == count and body["next_after"] is None
@@ -0,0 +1,77 @@
+import pytest
+
+
+class Loader(object):
+
+  def __init__(self):
+    self.calls = 0
+
+  def __call__(self):
+    self.calls += 1
+    return self.calls
+
+
+@pytest.fixture
+def now(server, monkeypatch):
+  now = [server.clock.time()]
+  monkeypatch.setattr(server.clock, "time", lambda: now[0])
+  return now
+
+
+def test_hits_and_ttl(server, now):
+  cache = server.RefCache(60, 8)
+  load = Loader()
+  assert cache.get("k", load) == 1
+  assert cache.get("k", load) == 1
+  now[0] += 59
+  assert cache.get("k", load) == 1
+  now[0] += 2
+  assert cache.get("k", load) == 2
+  assert cache.stats() == {"entries": 1, "max_entries": 8, "ttl": 60, "hits": 2, "misses": 2, "stale": 0}
+
+
+def test_least_recently_used_entries_are_evicted(server):
+  cache = server.RefCache(60, 2)
+  loads = dict((key, Loader()) for key in "abc")
+  cache.get("a", loads["a"])
+  cache.get("b", loads["b"])
+  cache.get("a", loads["a"])
+  cache.get("c", loads["c"])
+  assert list(cache.entries) == ["a", "c"]
+  cache.get("b", loads["b"])
+  assert loads["b"].calls == 2 and loads["a"].calls == 1
+  assert cache.stats()["entries"] == 2
+
+
+def test_table_versions(server, now):
+  cache = server.RefCache(60, 8)
+  load = Loader()
+  assert cache.get("companys", load, ("Companys",)) == 1
+  server.tables_changed("Positions")
+  assert cache.get("companys", load, ("Companys",)) == 1
+  server.tables_changed("Companys")
+  assert cache.get("companys", load, ("Companys",)) == 2
+  assert cache.get("companys", load, ("Companys",)) == 2
+  stats = cache.stats()
+  assert (stats["hits"], stats["misses"], stats["stale"]) == (2, 2, 1)
+
+
+def test_write_during_load_is_not_missed(server):
+  cache = server.RefCache(60, 8)
+  calls = []
+
+  def load():
+    calls.append(1)
+    if len(calls) == 1:
+      # A write lands while the list is being read.
+      server.tables_changed("Companys")
+    return len(calls)
+  assert cache.get("companys", load, ("Companys",)) == 1
+  assert cache.get("companys", load, ("Companys",)) == 2
+
+
+def test_cache_stats_endpoint(client):
+  client.get("/recruiter")
+  client.get("/recruiter")
+  stats = client.get("/internal/cache").get_json()
+  assert stats["hits"] >= 1 and stats["entries"] >= 1
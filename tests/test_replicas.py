@@ -0,0 +1,119 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+
+NEW_COMPANY = "/api/companys?name=%s"
+
+
+@pytest.fixture
+def replicas(server, tmp_path, monkeypatch):
+  """
+  Two SQLite replicas copied from the primary, which then lag behind it
+  forever, and an empty reference-data cache.
+  """
+  primary = sqlite3.connect(server.engine.url.database)
+  paths = []
+  for name in ("replica1.db", "replica2.db"):
+    paths.append(str(tmp_path / name))
+    copy = sqlite3.connect(paths[-1])
+    primary.backup(copy)
+    copy.close()
+  primary.close()
+  replicas = server.ReplicaSet([server.make_engine("sqlite:///" + path) for path in paths])
+  monkeypatch.setattr(server, "replicas", replicas)
+  monkeypatch.setattr(server, "ref_cache", server.RefCache(60, 64))
+  yield replicas
+  for e in replicas.engines:
+    e.dispose()
+
+
+def companys(client, name):
+  return client.get(NEW_COMPANY % name).get_json()["results"]
+
+
+def count(engine, sql, **params):
+  with engine.connect() as conn:
+    return conn.execute(text(sql), params).first()[0]
+
+
+def test_round_robin(client, replicas):
+  for i in range(4):
+    assert client.get(NEW_COMPANY % "Company 1").status_code == 200
+  assert [r["checkouts"] for r in replicas.stats()] == [2, 2]
+  # Routes not marked @read_only always use the primary.
+  client.get("/approveApplication")
+  assert [r["checkouts"] for r in replicas.stats()] == [2, 2]
+
+
+def test_replica_down(client, server, tmp_path, monkeypatch):
+  down = server.ReplicaSet([server.make_engine("sqlite:///" + str(tmp_path / "missing" / "replica.db"))])
+  monkeypatch.setattr(server, "replicas", down)
+  assert companys(client, "Company 1")
+  stats = down.stats()[0]
+  assert stats["failures"] == 1 and not stats["up"]
+  assert 0 < stats["retry_in"] <= server.REPLICA_RETRY_SECONDS
+  # Skipped while down, without trying it again.
+  assert companys(client, "Company 1")
+  assert down.stats()[0]["failures"] == 1
+  # Each further failure doubles the wait.
+  down.down_until[0] = 0.0
+  assert down.connect() is None
+  stats = down.stats()[0]
+  assert stats["failures"] == 2 and server.REPLICA_RETRY_SECONDS < stats["retry_in"] <= 2 * server.REPLICA_RETRY_SECONDS
+
+
+def test_replica_pool_full(client, server, tmp_path, monkeypatch):
+  monkeypatch.setattr(server, "DB_POOL_SIZE", 1)
+  monkeypatch.setattr(server, "DB_MAX_OVERFLOW", 0)
+  monkeypatch.setattr(server, "DB_POOL_TIMEOUT", 0.05)
+  busy = server.ReplicaSet([server.make_engine("sqlite:///" + server.engine.url.database)])
+  monkeypatch.setattr(server, "replicas", busy)
+  held = busy.engines[0].connect()
+  try:
+    response = client.get(NEW_COMPANY % "Company 1")
+    assert response.status_code == 503 and response.headers["Retry-After"]
+    # Busy is not down.
+    assert busy.stats()[0]["up"] and busy.stats()[0]["failures"] == 0
+  finally:
+    held.close()
+    busy.engines[0].dispose()
+  assert companys(client, "Company 1")
+
+
+def test_read_your_writes(client, server, replicas):
+  response = client.post("/company", data={"name": "Brand New Co", "description": "New", "location": "Here"})
+  assert response.status_code == 200
+  assert server.READ_PRIMARY_COOKIE in response.headers["Set-Cookie"]
+  # The write went to the primary only.
+  assert count(server.engine, "SELECT COUNT(*) FROM Companys WHERE name = 'Brand New Co'") == 1
+  for e in replicas.engines:
+    assert count(e, "SELECT COUNT(*) FROM Companys WHERE name = 'Brand New Co'") == 0
+  checkouts = [r["checkouts"] for r in replicas.stats()]
+  # The writer reads from the primary, everyone else from a replica.
+  assert companys(client, "Brand New Co")
+  assert [r["checkouts"] for r in replicas.stats()] == checkouts
+  assert companys(server.app.test_client(), "Brand New Co") == []
+
+
+def test_writes_to_read_only_routes_use_the_primary(server, replicas):
+  client = server.app.test_client()
+  response = client.post("/recruiter", data={"first_name": "Replica", "last_name": "Writer", "company_id": "1"})
+  assert response.status_code == 200 and b"Error" not in response.data
+  assert count(server.engine, "SELECT COUNT(*) FROM Recruiters WHERE first_name = 'Replica'") == 1
+  for e in replicas.engines:
+    assert count(e, "SELECT COUNT(*) FROM Recruiters WHERE first_name = 'Replica'") == 0
+
+
+def test_reference_lists_read_from_a_lagging_replica_are_not_cached(client, server, replicas, monkeypatch):
+  client.post("/company", data={"name": "Brand New Co 2", "description": "New", "location": "Here"})
+  other = server.app.test_client()
+  assert b"Brand New Co 2" not in other.get("/recruiter").data
+  # The writer's page comes from the primary and does not reuse that list.
+  assert b"Brand New Co 2" in client.get("/recruiter").data
+  # Once the replicas are caught up, their lists are cached like the primary's.
+  monkeypatch.setattr(server, "REPLICA_MAX_LAG_SECONDS", 0)
+  server.ref_cache.entries.clear()
+  other.get("/recruiter")
+  other.get("/recruiter")
+  assert server.ref_cache.stats()["hits"] >= 1
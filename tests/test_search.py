@@ -0,0 +1,60 @@
+import pytest
+
+NAMES = ["Quillfeather Analytics", "Quillfeather Holdings", "Quilted Goods"]
+
+
+@pytest.fixture(scope="module")
+def companys(server):
+  client = server.app.test_client()
+  for name in NAMES:
+    client.post("/company", data={"name": name, "description": "Search test", "location": "Here"})
+
+
+def search(client, q, kind="companys", **args):
+  response = client.get("/api/search", query_string=dict(args, q=q, kind=kind))
+  assert response.status_code == 200
+  return response.get_json()["results"]
+
+
+def test_prefix_match(client, companys):
+  results = search(client, "Quillfeather")
+  assert [r["name"] for r in results if r["prefix_match"]] == ["Quillfeather Analytics", "Quillfeather Holdings"]
+  assert search(client, "quillfeather h")[0]["name"] == "Quillfeather Holdings"
+
+
+def test_fuzzy_match(client, companys):
+  # A typo after the first two letters: no prefix matches, found by similarity.
+  results = search(client, "quilfeather holdings")
+  assert results and not any(r["prefix_match"] for r in results)
+  assert results[0]["name"] == "Quillfeather Holdings"
+  assert all(r["score"] >= 0.6 for r in results)
+
+
+def test_ranking(client, companys):
+  results = search(client, "quilt", page_size=100)
+  assert results[0]["name"] == "Quilted Goods" and results[0]["prefix_match"]
+  # Prefix matches first, then by score, then by id.
+  keys = [(not r["prefix_match"], -r["score"], r["id"]) for r in results]
+  assert keys == sorted(keys)
+
+
+def test_limit(client, companys):
+  assert len(search(client, "company", page_size=3)) == 3
+  assert len(search(client, "quillfeather", page_size=1)) == 1
+  results = client.get("/api/search?q=c&page_size=2").get_json()["results"]
+  for kind in ("companys", "candidates", "hosts", "recruiters"):
+    assert len([r for r in results if r["kind"] == kind]) <= 2
+
+
+def test_empty_and_short_queries(client, companys):
+  assert search(client, "") == []
+  assert search(client, "   ") == []
+  # One or two letters are only matched as a prefix.
+  assert search(client, "qx") == []
+  assert search(client, "qu") and all(r["prefix_match"] for r in search(client, "qu"))
+  assert client.get("/search").status_code == 200
+
+
+def test_search_page(client, companys):
+  page = client.get("/search?q=quilfeather holdings&kind=companys").get_data(as_text=True)
+  assert "Quillfeather Holdings" in page
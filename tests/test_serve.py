@@ -0,0 +1,36 @@
+class FakeCursor(object):
+
+  def __init__(self, log):
+    self.log = log
+
+  def execute(self, statement):
+    self.log.append(statement)
+
+  def close(self):
+    pass
+
+
+class FakeConnection(object):
+
+  def __init__(self):
+    self.log = []
+
+  def cursor(self):
+    return FakeCursor(self.log)
+
+  def commit(self):
+    self.log.append("COMMIT")
+
+
+def test_statement_timeout_is_set_and_committed(server, monkeypatch):
+  monkeypatch.setattr(server, "DB_STATEMENT_TIMEOUT", 2.5)
+  dbapi_connection = FakeConnection()
+  server.set_statement_timeout(dbapi_connection, None)
+  assert dbapi_connection.log == ["SET statement_timeout = 2500", "COMMIT"]
+
+
+def test_no_statement_timeout_by_default(server, monkeypatch):
+  monkeypatch.setattr(server, "DB_STATEMENT_TIMEOUT", 0)
+  dbapi_connection = FakeConnection()
+  server.set_statement_timeout(dbapi_connection, None)
+  assert dbapi_connection.log == []